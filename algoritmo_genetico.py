@@ -1,24 +1,31 @@
 # backend/algoritmo_genetico.py
 from __future__ import annotations
 
-from typing import List, Tuple, Sequence, Optional, Any
-import random
-from math import radians, sin, cos, asin, sqrt
+from typing import List, Tuple, Sequence, Optional, Any, Callable, Dict
+from math import radians, sin, cos, asin, sqrt, pi
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Generador PCG64 del módulo: un solo estado para todos los sorteos del GA
+_rng = np.random.default_rng()
 
 
 # =========================================================
 #   UTILIDAD: Distancia haversine en metros
 # =========================================================
+# Constantes a nivel módulo: no se reconstruyen en cada llamada
+_R_TIERRA_M = 6371000.0
+_DOS_R = 2.0 * _R_TIERRA_M
+_MEDIO_RAD = pi / 360.0  # radians(x) / 2 en una sola multiplicación
+
+
 def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371000.0
-    phi1 = radians(lat1)
-    phi2 = radians(lat2)
-    dphi = radians(lat2 - lat1)
-    dlambda = radians(lon2 - lon1)
+    s_phi = sin((lat2 - lat1) * _MEDIO_RAD)
+    s_lambda = sin((lon2 - lon1) * _MEDIO_RAD)
 
-    a = sin(dphi / 2.0) ** 2 + cos(phi1) * cos(phi2) * sin(dlambda / 2.0) ** 2
-    c = 2.0 * asin(sqrt(a))
-    return R * c
+    a = s_phi * s_phi + cos(radians(lat1)) * cos(radians(lat2)) * s_lambda * s_lambda
+    return _DOS_R * asin(sqrt(a))
 
 
 # =========================================================
@@ -46,24 +53,234 @@ def _centroide(camaras: Sequence[Any]) -> Tuple[float, float]:
     )
 
 
-def _dist_min_a_camaras(lat: float, lon: float, camaras: Sequence[Any]) -> float:
-    return min(
-        haversine_m(lat, lon, clat, clon)
-        for (clat, clon) in (_get_lat_lon(c) for c in camaras)
+# Cache por identidad del conjunto de cámaras: quien evalúa muchos puntos
+# contra la misma lista no vuelve a recorrerla para bbox/centroide/radianes.
+# Guarda la referencia para validar (un id() puede reutilizarse) y se acota
+# a pocas entradas porque cada request construye su propia lista.
+_CACHE_MAX = 8
+_cache_camaras: Dict[Tuple[str, int], Tuple[Sequence[Any], int, Any]] = {}
+
+
+def _cache_por_identidad(nombre: str, camaras: Sequence[Any], calcular: Callable[[Sequence[Any]], Any]) -> Any:
+    key = (nombre, id(camaras))
+    hit = _cache_camaras.get(key)
+    if hit is not None and hit[0] is camaras and hit[1] == len(camaras):
+        return hit[2]
+
+    valor = calcular(camaras)
+    if len(_cache_camaras) >= _CACHE_MAX:
+        _cache_camaras.clear()
+    _cache_camaras[key] = (camaras, len(camaras), valor)
+    return valor
+
+
+def _bbox_cached(camaras: Sequence[Any]) -> Tuple[float, float, float, float]:
+    return _cache_por_identidad("bbox", camaras, _bbox)
+
+
+def _centroide_cached(camaras: Sequence[Any]) -> Tuple[float, float]:
+    return _cache_por_identidad("centroide", camaras, _centroide)
+
+
+def _coords_camaras(camaras: Sequence[Any]) -> np.ndarray:
+    """Array (N, 2) float64 con (lat, lon) en grados de todas las cámaras."""
+    return np.array([_get_lat_lon(c) for c in camaras], dtype=np.float64).reshape(-1, 2)
+
+
+def preparar_camaras(camaras: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Arrays (lat, lon, cos(lat)) de todas las cámaras, con lat/lon en radianes.
+    Se calculan una sola vez por conjunto de cámaras para que las distancias
+    no repitan radians()/cos() de las cámaras en cada evaluación.
+    """
+    rad = np.radians(_coords_camaras(camaras))
+    cam_lat = rad[:, 0].copy()
+    cam_lon = rad[:, 1].copy()
+    return cam_lat, cam_lon, np.cos(cam_lat)
+
+
+def _preparar_camaras_solo_lectura(camaras: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    arrays = preparar_camaras(camaras)
+    for arr in arrays:
+        arr.setflags(write=False)  # compartidos por el cache: que nadie los modifique
+    return arrays
+
+
+def _cam_rad_cached(camaras: Sequence[Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _cache_por_identidad("cam_rad", camaras, _preparar_camaras_solo_lectura)
+
+
+def _haversine_a(lat1, lon1, cos1, lat2, lon2, cos2) -> np.ndarray:
+    """
+    Término 'a' de haversine (radianes, con broadcasting); cos1/cos2 = cos(lat) precalculados.
+    Es monótono con la distancia, así que sirve para comparar/ordenar
+    sin pagar sqrt + arcsin en cada par.
+    """
+    # ufuncs in-place: sobre la matriz (P, N) evita temporales extra
+    s_phi = np.subtract(lat2, lat1)
+    s_phi *= 0.5
+    np.sin(s_phi, out=s_phi)
+    s_phi *= s_phi
+
+    s_dl = np.subtract(lon2, lon1)
+    s_dl *= 0.5
+    np.sin(s_dl, out=s_dl)
+    s_dl *= s_dl
+    s_dl *= cos1
+    s_dl *= cos2
+
+    s_phi += s_dl
+    return s_phi
+
+
+def _a_a_metros(a) -> np.ndarray:
+    return _DOS_R * np.arcsin(np.sqrt(a))
+
+
+def _haversine_np(lat1, lon1, cos1, lat2, lon2, cos2) -> np.ndarray:
+    """Haversine (m) con broadcasting de NumPy; todas las coordenadas en radianes."""
+    return _a_a_metros(_haversine_a(lat1, lon1, cos1, lat2, lon2, cos2))
+
+
+# A partir de este número de cámaras conviene el KD-tree en lugar de la
+# matriz P×N completa (con pocas cámaras la matriz densa es igual o más rápida).
+_MIN_CAMARAS_ARBOL = 32
+
+
+def _xyz_unitario(lat_r, lon_r, cos_lat) -> np.ndarray:
+    """(lat, lon) en radianes y cos(lat) -> vectores unitarios 3D (..., 3)."""
+    return np.stack((cos_lat * np.cos(lon_r), cos_lat * np.sin(lon_r), np.sin(lat_r)), axis=-1)
+
+
+def _arbol_camaras(cam_lat: np.ndarray, cam_lon: np.ndarray, cam_cos: np.ndarray) -> cKDTree:
+    """
+    KD-tree sobre las cámaras en la esfera unitaria.
+    La distancia euclidiana (cuerda) es monótona con la distancia haversine:
+    a = (cuerda / 2)^2, así que los vecinos más cercanos son exactamente los mismos.
+    """
+    return cKDTree(_xyz_unitario(cam_lat, cam_lon, cam_cos))
+
+
+# =========================================================
+#   FITNESS VECTORIZADO: toda la población a la vez
+# =========================================================
+def _vecinas_densas(
+    lat_r: np.ndarray, lon_r: np.ndarray, cos_r: np.ndarray,
+    cam_lat: np.ndarray, cam_lon: np.ndarray, cam_cos: np.ndarray,
+    k: int,
+    radio_cobertura_m: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """dmin, promedio de k vecinas y máscara de cubiertos con la matriz P×N completa."""
+    # Matriz (P, N) del término 'a' en float64: con N < _MIN_CAMARAS_ARBOL cabe
+    # en caché, y restar radianes absolutos en float32 pasa de 1 m de error
+    # lejos del meridiano 0. sqrt/arcsin solo se aplican a lo ya reducido.
+    A = _haversine_a(
+        lat_r[:, None], lon_r[:, None], cos_r[:, None],
+        cam_lat[None, :], cam_lon[None, :], cam_cos[None, :],
     )
 
+    dmin = _a_a_metros(A.min(axis=1))
+    cubierto = dmin <= radio_cobertura_m
+
+    # Los puntos cubiertos solo usan dmin: las k vecinas se calculan
+    # únicamente para los no cubiertos (la mayoría en datasets densos).
+    d_k = np.zeros_like(dmin)
+    libres = ~cubierto
+    if libres.any():
+        A_libres = A[libres]
+        if k < A.shape[1]:
+            A_libres = np.partition(A_libres, k - 1, axis=1)[:, :k]
+        d_k[libres] = _a_a_metros(A_libres).mean(axis=1)
+
+    return dmin, d_k, cubierto
+
+
+def fitness_poblacion(
+    pop_lat: np.ndarray,
+    pop_lon: np.ndarray,
+    cam_lat: np.ndarray,
+    cam_lon: np.ndarray,
+    cam_cos: np.ndarray,
+    bbox: Tuple[float, float, float, float],
+    centroide: Tuple[float, float],
+    radio_cobertura_m: float = 80.0,
+    max_interes_m: float = 350.0,
+    max_extrapolacion_m: float = 900.0,
+    k_vecinos: int = 4,
+    borde_frac_penal: float = 0.10,
+    arbol: Optional[cKDTree] = None,
+) -> np.ndarray:
+    """
+    Misma lógica que fitness_punto_completo, pero para P puntos a la vez.
+
+    pop_lat/pop_lon en grados (shape P); cam_lat/cam_lon/cam_cos como los
+    devuelve preparar_camaras (shape N).
+    Calcula una sola matriz de distancias P×N por generación y la reduce
+    a dmin, promedio de k vecinas y distancia al centroide por individuo.
+    Si se pasa `arbol` (ver _arbol_camaras), las vecinas salen de consultas
+    al KD-tree en O(log N) en lugar de la matriz completa.
+    """
+    # float64 contiguo: pop[:, 0] de un array (P, 2) es una vista con stride,
+    # y las ufuncs de NumPy solo usan sus rutas SIMD sobre memoria contigua.
+    lat = np.ascontiguousarray(pop_lat, dtype=np.float64)
+    lon = np.ascontiguousarray(pop_lon, dtype=np.float64)
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    cos_r = np.cos(lat_r)
+
+    n_cam = cam_lat.shape[0]
+    k = max(1, min(k_vecinos, n_cam))
+
+    if arbol is not None:
+        # workers=-1: las P consultas son independientes, se reparten en todos los núcleos
+        cuerda, _ = arbol.query(_xyz_unitario(lat_r, lon_r, cos_r), k=k, workers=-1)
+        dist_k = _a_a_metros(np.minimum((cuerda.reshape(lat.shape[0], k) * 0.5) ** 2, 1.0))
+        dmin = dist_k[:, 0]
+        d_k = dist_k.mean(axis=1)
+        cubierto = dmin <= radio_cobertura_m
+    else:
+        dmin, d_k, cubierto = _vecinas_densas(
+            lat_r, lon_r, cos_r, cam_lat, cam_lon, cam_cos, k, radio_cobertura_m
+        )
+
+    # --- CAMBIO CLAVE ---
+    # Si ya está cubierto, antes era 0.0 (colapsa con muchas cámaras).
+    # Ahora damos un score pequeño proporcional: mientras más cerca del borde de cobertura,
+    # "menos cubierto" está (pero sigue siendo bajo).
+    score_cubierto = np.minimum(dmin * (0.05 / max(radio_cobertura_m, 1e-9)), 0.05)
+
+    # Extrapolación respecto al centroide
+    c_lat, c_lon = centroide
+    c_lat_r = radians(c_lat)
+    d_cent = _haversine_np(lat_r, lon_r, cos_r, c_lat_r, radians(c_lon), cos(c_lat_r))
 
-def _dist_prom_k_vecinas(lat: float, lon: float, camaras: Sequence[Any], k: int = 3) -> float:
-    dists = sorted(
-        haversine_m(lat, lon, clat, clon)
-        for (clat, clon) in (_get_lat_lon(c) for c in camaras)
+    # Borde del bbox (evita “irse a orillas”)
+    min_lat, max_lat, min_lon, max_lon = bbox
+    lat_borde = max(max_lat - min_lat, 1e-9) * borde_frac_penal
+    lon_borde = max(max_lon - min_lon, 1e-9) * borde_frac_penal
+    cerca_borde = (
+        (lat < min_lat + lat_borde) |
+        (lat > max_lat - lat_borde) |
+        (lon < min_lon + lon_borde) |
+        (lon > max_lon - lon_borde)
     )
-    k = max(1, min(k, len(dists)))
-    return sum(dists[:k]) / k
 
+    # Score combinado sin ramas, todo con clip sobre arrays:
+    # - hueco (0..1): dmin normalizado respecto a max_interes_m
+    # - interno (0..1): 1 - d_k normalizado (cerca de varias cámaras = más interno)
+    # - extrapolación: lejos del centroide; clip a 0 cuando d_cent <= max_interes_m.
+    #   Peso 0.70 * 0.5 (castigo menos agresivo para no matar todo en datasets grandes)
+    # - borde: 0.15 fijo si está en la franja del bbox
+    inv_interes = 1.0 / max(max_interes_m, 1e-9)
+    inv_extrap = 1.0 / max((max_extrapolacion_m - max_interes_m), 1e-9)
+
+    score = 0.70 * np.clip(dmin * inv_interes, 0.0, 1.0)
+    score += 0.30 * (1.0 - np.clip(d_k * inv_interes, 0.0, 1.0))
+    score -= 0.35 * np.clip((d_cent - max_interes_m) * inv_extrap, 0.0, 1.0)
+    score -= 0.15 * cerca_borde
+    np.clip(score, 0.0, 1.0, out=score)
 
-def _clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
+    return np.where(cubierto, score_cubierto, score)
 
 
 # =========================================================
@@ -82,6 +299,12 @@ def fitness_punto_completo(
     k_vecinos: int = 4,
     # penalización si el punto se pega al borde del bbox
     borde_frac_penal: float = 0.10,  # 10% del bbox como “zona borde”
+    # Precalculados (opcionales): si el llamador evalúa muchos puntos contra el
+    # mismo conjunto de cámaras, debe pasarlos para no recalcularlos en cada llamada.
+    # cam_rad = resultado de preparar_camaras(camaras)
+    cam_rad: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None,
+    centroide: Optional[Tuple[float, float]] = None,
 ) -> float:
     """
     Score final (0..1), donde 1 = mejor candidato a punto ciego / zona subcubierta.
@@ -95,128 +318,87 @@ def fitness_punto_completo(
     Con muchas cámaras (densidad alta), casi todo puede quedar "cubierto" (dmin <= radio).
     Si devolvemos 0 en esos casos, el GA se queda sin gradiente y colapsa.
     Por eso aquí usamos penalización SUAVE en lugar de 0 absoluto.
+
+    Evalúa un solo punto con el mismo kernel vectorizado que usa el GA
+    (fitness_poblacion), así solo hay una implementación del cálculo.
     """
     if not camaras:
         return 0.0
 
-    lat, lon = float(punto[0]), float(punto[1])
-
-    # Distancia mínima a cámaras
-    dmin = _dist_min_a_camaras(lat, lon, camaras)
-
-    # --- CAMBIO CLAVE ---
-    # Si ya está cubierto, antes era 0.0 (colapsa con muchas cámaras).
-    # Ahora damos un score pequeño proporcional: mientras más cerca del borde de cobertura,
-    # "menos cubierto" está (pero sigue siendo bajo).
-    if dmin <= radio_cobertura_m:
-        return _clamp(0.05 * (dmin / max(radio_cobertura_m, 1e-9)), 0.0, 0.05)
-
-    # Hueco: distancia normalizada (0..1) respecto a max_interes_m
-    # --- CAMBIO: más estable que (d - radio)/(max - radio) en escenarios densos ---
-    d_use = min(dmin, max_interes_m)
-    hueco = d_use / max(max_interes_m, 1e-9)
-    hueco = _clamp(hueco, 0.0, 1.0)
-
-    # Internidad: si está cerca de varias cámaras, d_k será moderado
-    d_k = _dist_prom_k_vecinas(lat, lon, camaras, k=k_vecinos)
-    interno = 1.0 - min(d_k / max(max_interes_m, 1e-9), 1.0)  # 1 = más interno
-    interno = _clamp(interno, 0.0, 1.0)
-
-    # Penalización por extrapolación (muy lejos del centroide)
-    c_lat, c_lon = _centroide(camaras)
-    d_cent = haversine_m(lat, lon, c_lat, c_lon)
-
-    penal_extrap = 0.0
-    if d_cent > max_interes_m:
-        penal_extrap = (d_cent - max_interes_m) / max((max_extrapolacion_m - max_interes_m), 1e-9)
-        penal_extrap = _clamp(penal_extrap, 0.0, 1.0)
-
-    # --- CAMBIO: castigo menos agresivo para no matar todo en datasets grandes ---
-    penal_extrap *= 0.5
-
-    # Penalización por borde del bbox (evita “irse a orillas”)
-    min_lat, max_lat, min_lon, max_lon = _bbox(camaras)
-    lat_span = max(max_lat - min_lat, 1e-9)
-    lon_span = max(max_lon - min_lon, 1e-9)
-
-    lat_borde = lat_span * borde_frac_penal
-    lon_borde = lon_span * borde_frac_penal
-
-    cerca_borde = (
-        (lat < min_lat + lat_borde) or
-        (lat > max_lat - lat_borde) or
-        (lon < min_lon + lon_borde) or
-        (lon > max_lon - lon_borde)
+    cam_lat, cam_lon, cam_cos = cam_rad if cam_rad is not None else _cam_rad_cached(camaras)
+    if bbox is None:
+        bbox = _bbox_cached(camaras)
+    if centroide is None:
+        centroide = _centroide_cached(camaras)
+
+    score = fitness_poblacion(
+        np.array([float(punto[0])]), np.array([float(punto[1])]),
+        cam_lat, cam_lon, cam_cos,
+        bbox=bbox, centroide=centroide,
+        radio_cobertura_m=radio_cobertura_m,
+        max_interes_m=max_interes_m,
+        max_extrapolacion_m=max_extrapolacion_m,
+        k_vecinos=k_vecinos,
+        borde_frac_penal=borde_frac_penal,
     )
-    penal_borde = 0.15 if cerca_borde else 0.0  # --- CAMBIO: un poco más suave ---
-
-    # Combinar
-    score = (0.70 * hueco + 0.30 * interno) - (0.70 * penal_extrap) - penal_borde
-    return _clamp(score, 0.0, 1.0)
+    return float(score[0])
 
 
 # =========================================================
 #   SELECCIÓN: Torneo (estable)
 # =========================================================
 def seleccion_torneo(
-    poblacion: List[Tuple[float, float]],
-    fitnesses: List[float],
+    poblacion: np.ndarray,
+    fitnesses: Sequence[float],
     k_torneo: int = 4,
     n: Optional[int] = None
-) -> List[Tuple[float, float]]:
+) -> np.ndarray:
     if n is None:
         n = len(poblacion)
 
-    idxs = list(range(len(poblacion)))
-    seleccionados: List[Tuple[float, float]] = []
-
-    for _ in range(n):
-        contendientes = random.sample(idxs, k=min(k_torneo, len(idxs)))
-        best = max(contendientes, key=lambda i: fitnesses[i])
-        seleccionados.append(poblacion[best])
+    # Todos los torneos a la vez: matriz (n, k) de contendientes (con reemplazo)
+    fit = np.asarray(fitnesses, dtype=float)
+    idxs = _rng.integers(0, len(poblacion), size=(n, max(1, k_torneo)))
+    ganadores = idxs[np.arange(n), fit[idxs].argmax(axis=1)]
 
-    return seleccionados
+    return poblacion[ganadores]
 
 
 # =========================================================
 #   CRUZA: BLX-alpha (reales)
 # =========================================================
 def cruzar_blx_alpha(
-    p1: Tuple[float, float],
-    p2: Tuple[float, float],
+    p1: np.ndarray,
+    p2: np.ndarray,
     alpha: float = 0.5
-) -> Tuple[float, float]:
-    (x1, y1), (x2, y2) = p1, p2
-
-    def _blx(a: float, b: float) -> float:
-        lo = min(a, b)
-        hi = max(a, b)
-        d = hi - lo
-        return random.uniform(lo - alpha * d, hi + alpha * d)
-
-    return (_blx(x1, x2), _blx(y1, y2))
+) -> np.ndarray:
+    """BLX-alpha por pares: p1/p2 shape (K, 2) -> K hijos (K, 2)."""
+    lo = np.minimum(p1, p2)
+    hi = np.maximum(p1, p2)
+    d = hi - lo
+    return _rng.uniform(lo - alpha * d, hi + alpha * d)
 
 
 # =========================================================
 #   MUTACIÓN: Gauss + clamp bbox
 # =========================================================
 def mutar_gauss(
-    ind: Tuple[float, float],
+    pop: np.ndarray,
     min_lat: float, max_lat: float,
     min_lon: float, max_lon: float,
     sigma_lat: float = 0.0007,
     sigma_lon: float = 0.0007,
     prob_mut: float = 0.25
-) -> Tuple[float, float]:
-    lat, lon = ind
-
-    if random.random() < prob_mut:
-        lat += random.gauss(0.0, sigma_lat)
-        lon += random.gauss(0.0, sigma_lon)
-
-    lat = _clamp(lat, min_lat, max_lat)
-    lon = _clamp(lon, min_lon, max_lon)
-    return (lat, lon)
+) -> np.ndarray:
+    """
+    Mutación gaussiana de una población (P, 2); cada individuo muta con prob_mut.
+    Modifica `pop` in-place (y lo devuelve).
+    """
+    mask = _rng.random(pop.shape[0]) < prob_mut
+    # solo se sortean normales para las filas que mutan
+    pop[mask] += _rng.standard_normal((int(mask.sum()), 2)) * (sigma_lat, sigma_lon)
+    np.clip(pop, (min_lat, min_lon), (max_lat, max_lon), out=pop)
+    return pop
 
 
 # =========================================================
@@ -228,26 +410,36 @@ def seleccionar_espaciados(
     max_puntos: int
 ) -> List[Tuple[float, float, float]]:
     seleccionados: List[Tuple[float, float, float]] = []
+    if not candidatos:
+        return seleccionados
+
+    # Distancias entre todos los candidatos de una vez (C×C, C = tamaño de población)
+    rad = np.radians(np.array([(c[0], c[1]) for c in candidatos], dtype=np.float64))
+    lat_r = rad[:, 0]
+    lon_r = rad[:, 1]
+    cos_r = np.cos(lat_r)
+    D = _haversine_np(
+        lat_r[:, None], lon_r[:, None], cos_r[:, None],
+        lat_r[None, :], lon_r[None, :], cos_r[None, :],
+    )
 
-    for lat, lon, fit in candidatos:
+    idx_sel: List[int] = []
+    for i, c in enumerate(candidatos):
         if len(seleccionados) >= max_puntos:
             break
 
-        ok = True
-        for slat, slon, _ in seleccionados:
-            if haversine_m(lat, lon, slat, slon) < min_sep_m:
-                ok = False
-                break
-
-        if ok:
-            seleccionados.append((lat, lon, fit))
+        if not idx_sel or D[i, idx_sel].min() >= min_sep_m:
+            idx_sel.append(i)
+            seleccionados.append(c)
 
-    # Si faltan, rellena con mejores restantes
+    # Si faltan, rellena con mejores restantes (set: chequeo O(1) por candidato)
     if len(seleccionados) < max_puntos:
+        elegidos = {(lat, lon) for lat, lon, _ in seleccionados}
         for c in candidatos:
             if len(seleccionados) >= max_puntos:
                 break
-            if c not in seleccionados:
+            if (c[0], c[1]) not in elegidos:
+                elegidos.add((c[0], c[1]))
                 seleccionados.append(c)
 
     return seleccionados
@@ -282,7 +474,7 @@ def algoritmo_genetico_puntos_ciegos(
         return []
 
     # bbox “real” del conjunto
-    min_lat0, max_lat0, min_lon0, max_lon0 = _bbox(camaras)
+    min_lat0, max_lat0, min_lon0, max_lon0 = _bbox_cached(camaras)
 
     # margen (permite explorar alrededor del conjunto)
     lat_span = max(max_lat0 - min_lat0, 1e-9)
@@ -295,65 +487,60 @@ def algoritmo_genetico_puntos_ciegos(
     min_lon = min_lon0 - lon_margin
     max_lon = max_lon0 + lon_margin
 
-    # población inicial
-    poblacion: List[Tuple[float, float]] = [
-        (random.uniform(min_lat, max_lat), random.uniform(min_lon, max_lon))
-        for _ in range(tam_poblacion)
-    ]
+    # estado fijo durante todo el GA: cámaras en radianes (+cos), bbox y centroide
+    cam_lat, cam_lon, cam_cos = preparar_camaras(camaras)
+    bbox = (min_lat0, max_lat0, min_lon0, max_lon0)
+    centroide = _centroide_cached(camaras)
+    arbol = _arbol_camaras(cam_lat, cam_lon, cam_cos) if cam_lat.shape[0] >= _MIN_CAMARAS_ARBOL else None
+
+    # población inicial: array (P, 2) con columnas lat, lon
+    poblacion = np.empty((tam_poblacion, 2))
+    poblacion[:, 0] = _rng.uniform(min_lat, max_lat, tam_poblacion)
+    poblacion[:, 1] = _rng.uniform(min_lon, max_lon, tam_poblacion)
+
+    def _evaluar(pop: np.ndarray) -> np.ndarray:
+        return fitness_poblacion(
+            pop[:, 0], pop[:, 1], cam_lat, cam_lon, cam_cos,
+            bbox=bbox, centroide=centroide,
+            radio_cobertura_m=radio_cobertura_m,
+            max_interes_m=max_interes_m,
+            max_extrapolacion_m=max_extrapolacion_m,
+            k_vecinos=k_vecinos,
+            arbol=arbol,
+        )
+
+    n_elite = min(max(1, elitismo), tam_poblacion)
 
     for _ in range(generaciones):
-        fitnesses = [
-            fitness_punto_completo(
-                ind, camaras,
-                radio_cobertura_m=radio_cobertura_m,
-                max_interes_m=max_interes_m,
-                max_extrapolacion_m=max_extrapolacion_m,
-                k_vecinos=k_vecinos,
-            )
-            for ind in poblacion
-        ]
-
-        # Elitismo: top-k
-        orden = sorted(range(len(poblacion)), key=lambda i: fitnesses[i], reverse=True)
-        elites = [poblacion[i] for i in orden[:max(1, elitismo)]]
+        fitnesses = _evaluar(poblacion)
+
+        # Elitismo: top-k con argpartition, O(P), sin ordenar toda la población
+        elites = poblacion[np.argpartition(-fitnesses, n_elite - 1)[:n_elite]]
 
         # Selección torneo
         padres = seleccion_torneo(poblacion, fitnesses, k_torneo=k_torneo, n=tam_poblacion)
 
-        nueva: List[Tuple[float, float]] = []
-        nueva.extend(elites)
-
-        while len(nueva) < tam_poblacion:
-            p1 = random.choice(padres)
-            p2 = random.choice(padres)
-            hijo = cruzar_blx_alpha(p1, p2, alpha=alpha_blx)
-
-            hijo = mutar_gauss(
-                hijo,
-                min_lat=min_lat, max_lat=max_lat,
-                min_lon=min_lon, max_lon=max_lon,
-            )
-
-            # --- CAMBIO CLAVE ---
-            # Ya NO hacemos clamp al bbox original, porque eso mata la exploración
-            # y deja al GA sin opciones si el bbox original está totalmente cubierto.
-            nueva.append(hijo)
+        # Hijos de una vez: cruza + mutación sobre arrays (K, 2)
+        n_hijos = max(0, tam_poblacion - len(elites))
+        # Todas las parejas en un solo sorteo (n_hijos, 2) de índices de padres
+        pares = _rng.integers(0, len(padres), size=(n_hijos, 2))
+        hijos = cruzar_blx_alpha(padres[pares[:, 0]], padres[pares[:, 1]], alpha=alpha_blx)
+
+        # --- CAMBIO CLAVE ---
+        # Ya NO hacemos clamp al bbox original, porque eso mata la exploración
+        # y deja al GA sin opciones si el bbox original está totalmente cubierto.
+        hijos = mutar_gauss(
+            hijos,
+            min_lat=min_lat, max_lat=max_lat,
+            min_lon=min_lon, max_lon=max_lon,
+        )
 
-        poblacion = nueva
+        poblacion = np.concatenate((elites, hijos))
 
     # evaluación final
-    fitnesses_final = [
-        fitness_punto_completo(
-            ind, camaras,
-            radio_cobertura_m=radio_cobertura_m,
-            max_interes_m=max_interes_m,
-            max_extrapolacion_m=max_extrapolacion_m,
-            k_vecinos=k_vecinos,
-        )
-        for ind in poblacion
-    ]
+    fitnesses_final = _evaluar(poblacion)
 
-    candidatos = [(lat, lon, fit) for (lat, lon), fit in zip(poblacion, fitnesses_final)]
+    candidatos = [(lat, lon, fit) for (lat, lon), fit in zip(poblacion.tolist(), fitnesses_final.tolist())]
     candidatos.sort(key=lambda x: x[2], reverse=True)
 
     # diversidad para no amontonarse
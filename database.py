@@ -148,9 +148,15 @@ class CamaraRead(CamaraBase):
 #   SEGURIDAD
 # =========================================================
 
+# Mismo contexto que main.py: comparten la tabla usuarios y main.py migra los
+# hashes pbkdf2_sha256 a argon2 al iniciar sesión, así que aquí hay que poder
+# verificar ambos esquemas.
 pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],
-    deprecated="auto"
+    schemes=["argon2", "pbkdf2_sha256"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=64 * 1024,
+    argon2__parallelism=2,
 )
 
 
@@ -1,28 +1,41 @@
 # backend/ga_cobertura.py
 from __future__ import annotations
 
-from typing import Any, List, Tuple, Sequence, Optional, Dict
-import random
-from math import radians, sin, cos, asin, sqrt
+from typing import Any, Callable, Tuple, Sequence, Optional, Dict
+from itertools import chain
+from math import radians, sin, cos, asin, sqrt, pi
+
+import numpy as np
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
+_rng = np.random.default_rng()
 
 
 # =========================================================
 #   UTILIDAD: Distancia haversine en metros
 # =========================================================
+# Constantes a nivel módulo: no se reconstruyen en cada llamada
+_R_TIERRA_M = 6371000.0
+_DOS_R = 2.0 * _R_TIERRA_M
+_MEDIO_RAD = pi / 360.0  # radians(x) / 2 en una sola multiplicación
+
+
 def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    R = 6371000.0
-    phi1 = radians(lat1)
-    phi2 = radians(lat2)
-    dphi = radians(lat2 - lat1)
-    dlambda = radians(lon2 - lon1)
+    s_phi = sin((lat2 - lat1) * _MEDIO_RAD)
+    s_lambda = sin((lon2 - lon1) * _MEDIO_RAD)
+
+    a = s_phi * s_phi + cos(radians(lat1)) * cos(radians(lat2)) * s_lambda * s_lambda
+    return _DOS_R * asin(sqrt(a))
 
-    a = sin(dphi / 2.0) ** 2 + cos(phi1) * cos(phi2) * sin(dlambda / 2.0) ** 2
-    c = 2.0 * asin(sqrt(a))
-    return R * c
 
+def _haversine_a_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Término 'a' de haversine con broadcasting de NumPy; coordenadas en radianes."""
+    return np.sin((lat2 - lat1) * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2
 
-def _clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
+
+def _a_a_metros(a) -> np.ndarray:
+    return _DOS_R * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
 
 def _get_lat_lon(obj: Any) -> Tuple[float, float]:
@@ -42,21 +55,47 @@ def _bbox(camaras: Sequence[Any]) -> Tuple[float, float, float, float]:
 # =========================================================
 #   GRID DE EVALUACIÓN (puntos dentro del bbox)
 # =========================================================
+# El grid solo depende del bbox y de los parámetros: mientras las cámaras no
+# cambien, cada request reutiliza el mismo array (de solo lectura).
+_CACHE_GRID_MAX = 16
+_cache_grid: Dict[Tuple[Any, ...], np.ndarray] = {}
+
+
 def generar_grid_puntos(
     camaras: Sequence[Any],
     step_m: float = 150.0,
     margin_factor: float = 0.05,
     max_points: int = 6000,
-) -> List[Tuple[float, float]]:
+) -> np.ndarray:
     """
     Genera puntos (lat, lon) en una rejilla sobre el bbox de cámaras.
     step_m = separación aproximada entre puntos en metros.
     max_points limita la cantidad final (si se excede, se submuestrea).
+    Devuelve un array (M, 2) con columnas lat, lon, de solo lectura: se
+    cachea por (len, bbox redondeado a ~1 m, step_m, margin_factor, max_points).
     """
     if not camaras:
-        return []
+        return np.empty((0, 2))
+
+    bbox = _bbox(camaras)
+    key = (len(camaras), tuple(round(v, 5) for v in bbox), step_m, margin_factor, max_points)
+    pts = _cache_grid.get(key)
+    if pts is None:
+        pts = _grid_en_bbox(bbox, step_m, margin_factor, max_points)
+        pts.flags.writeable = False
+        if len(_cache_grid) >= _CACHE_GRID_MAX:
+            _cache_grid.clear()
+        _cache_grid[key] = pts
+    return pts
+
 
-    min_lat, max_lat, min_lon, max_lon = _bbox(camaras)
+def _grid_en_bbox(
+    bbox: Tuple[float, float, float, float],
+    step_m: float,
+    margin_factor: float,
+    max_points: int,
+) -> np.ndarray:
+    min_lat, max_lat, min_lon, max_lon = bbox
 
     lat_span = max(max_lat - min_lat, 1e-9)
     lon_span = max(max_lon - min_lon, 1e-9)
@@ -72,17 +111,17 @@ def generar_grid_puntos(
     step_lat = step_m / m_per_deg_lat
     step_lon = step_m / max(m_per_deg_lon, 1e-6)
 
-    pts: List[Tuple[float, float]] = []
-    lat = min_lat
-    while lat <= max_lat:
-        lon = min_lon
-        while lon <= max_lon:
-            pts.append((float(lat), float(lon)))
-            lon += step_lon
-        lat += step_lat
+    # Índices enteros * paso (sin acumular sumas flotantes): límites deterministas
+    n_lat = int(np.floor((max_lat - min_lat) / step_lat)) + 1
+    n_lon = int(np.floor((max_lon - min_lon) / step_lon)) + 1
+    lats = min_lat + step_lat * np.arange(n_lat)
+    lons = min_lon + step_lon * np.arange(n_lon)
+
+    grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+    pts = np.column_stack((grid_lat.ravel(), grid_lon.ravel()))
 
     if max_points and len(pts) > max_points:
-        pts = random.sample(pts, k=max_points)
+        pts = pts[_rng.choice(len(pts), size=max_points, replace=False)]
 
     return pts
 
@@ -90,17 +129,101 @@ def generar_grid_puntos(
 # =========================================================
 #   COBERTURA Y NIVELES
 # =========================================================
+def _conteo_cobertura(
+    puntos: Sequence[Tuple[float, float]],
+    camaras: Sequence[Tuple[float, float]],
+    radio_m: float,
+    bloque: int = 1024,
+) -> np.ndarray:
+    """
+    Número de cámaras a <= radio_m de cada punto, shape (M,).
+    Matriz de distancias por bloques de `bloque` puntos (acota la memoria
+    a bloque×N). Compara el término 'a' de haversine contra sin²(radio/2R),
+    que equivale a d <= radio_m sin calcular sqrt/arcsin en cada par.
+    """
+    pts = np.radians(np.asarray(puntos, dtype=np.float64).reshape(-1, 2))
+    cams = np.radians(np.asarray(camaras, dtype=np.float64).reshape(-1, 2))
+    conteo = np.zeros(len(pts), dtype=np.int64)
+    if len(pts) == 0 or len(cams) == 0:
+        return conteo
+
+    a_max = sin(min(radio_m / _DOS_R, pi / 2.0)) ** 2
+    cam_lat = cams[:, 0]
+    cam_lon = cams[:, 1]
+    cam_cos = np.cos(cam_lat)
+
+    for i in range(0, len(pts), bloque):
+        lat = pts[i:i + bloque, 0:1]
+        lon = pts[i:i + bloque, 1:2]
+        a = np.sin((cam_lat - lat) * 0.5) ** 2 + np.cos(lat) * cam_cos * np.sin((cam_lon - lon) * 0.5) ** 2
+        conteo[i:i + bloque] = np.count_nonzero(a <= a_max, axis=1)
+
+    return conteo
+
+
+def _preparar_puntos(puntos: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Arrays contiguos (lat, lon, cos(lat)) de los puntos, lat/lon en radianes.
+    Se preparan una vez por llamada a fitness_cobertura_poblacion y los
+    comparten todos los bloques de _conteo_cobertura_poblacion, en lugar de
+    repetir radians()/cos() sobre los M puntos en cada bloque.
+    """
+    rad = np.radians(np.asarray(puntos, dtype=np.float64).reshape(-1, 2))
+    p_lat = np.ascontiguousarray(rad[:, 0])
+    p_lon = np.ascontiguousarray(rad[:, 1])
+    return p_lat, p_lon, np.cos(p_lat)
+
+
+def _conteo_cobertura_poblacion(
+    puntos_prep: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    pop_r: np.ndarray,
+    radio_m: float,
+    max_elementos: int = 1 << 22,
+) -> np.ndarray:
+    """
+    Cámaras nuevas a <= radio_m de cada punto, para toda la población: shape (P, M).
+    puntos_prep como lo devuelve _preparar_puntos y pop_r (P, N, 2) en radianes.
+    El tensor (b, N, M) se arma por bloques de individuos para no pasar de
+    `max_elementos` a la vez.
+    """
+    p_lat, p_lon, p_cos = puntos_prep
+    n_pop, n_cam = pop_r.shape[:2]
+    conteo = np.zeros((n_pop, len(p_lat)), dtype=np.int64)
+    if n_cam == 0 or len(p_lat) == 0:
+        return conteo
+
+    # Umbral sobre 'a' (sin sqrt/arcsin) y solo multiplicaciones en el bucle
+    a_max = sin(min(radio_m / _DOS_R, pi / 2.0)) ** 2
+
+    paso = max(1, max_elementos // (n_cam * len(p_lat)))
+    for i in range(0, n_pop, paso):
+        lat = pop_r[i:i + paso, :, 0:1]
+        lon = pop_r[i:i + paso, :, 1:2]
+
+        # ufuncs in-place sobre el tensor (b, N, M): sin temporales extra
+        a = np.subtract(p_lat, lat)
+        a *= 0.5
+        np.sin(a, out=a)
+        a *= a
+        s_dl = np.subtract(p_lon, lon)
+        s_dl *= 0.5
+        np.sin(s_dl, out=s_dl)
+        s_dl *= s_dl
+        s_dl *= p_cos
+        s_dl *= np.cos(lat)
+        a += s_dl
+
+        conteo[i:i + paso] = np.count_nonzero(a <= a_max, axis=1)
+
+    return conteo
+
+
 def contar_cobertura_en_punto(
     punto: Tuple[float, float],
     camaras: Sequence[Tuple[float, float]],
     radio_m: float,
 ) -> int:
-    lat, lon = punto
-    count = 0
-    for clat, clon in camaras:
-        if haversine_m(lat, lon, clat, clon) <= radio_m:
-            count += 1
-    return count
+    return int(_conteo_cobertura([punto], camaras, radio_m)[0])
 
 
 def metricas_niveles_cobertura(
@@ -108,7 +231,7 @@ def metricas_niveles_cobertura(
     camaras_totales: Sequence[Tuple[float, float]],
     radio_m: float,
 ) -> Dict[str, float]:
-    if not puntos_eval:
+    if len(puntos_eval) == 0:
         return {
             "cobertura_total": 0.0,
             "sin_cobertura": 100.0,
@@ -117,19 +240,15 @@ def metricas_niveles_cobertura(
             "nivel_3_mas": 0.0,
         }
 
-    n = len(puntos_eval)
-    c0 = c1 = c2 = c3 = 0
+    return _metricas_desde_conteo(_conteo_cobertura(puntos_eval, camaras_totales, radio_m))
+
+
+def _metricas_desde_conteo(conteo: np.ndarray) -> Dict[str, float]:
+    """Métricas de niveles a partir del conteo (M,) de cámaras por punto (M > 0)."""
+    n = len(conteo)
 
-    for p in puntos_eval:
-        k = contar_cobertura_en_punto(p, camaras_totales, radio_m)
-        if k <= 0:
-            c0 += 1
-        elif k == 1:
-            c1 += 1
-        elif k == 2:
-            c2 += 1
-        else:
-            c3 += 1
+    # histograma de niveles 0, 1, 2, 3+ en una sola pasada
+    c0, c1, c2, c3 = (int(c) for c in np.bincount(np.minimum(conteo, 3), minlength=4))
 
     sin_cob = (c0 / n) * 100.0
     cov_total = 100.0 - sin_cob
@@ -143,6 +262,138 @@ def metricas_niveles_cobertura(
     }
 
 
+# =========================================================
+#   PROYECCIÓN LOCAL EN METROS + KD-TREE DEL GRID
+# =========================================================
+def _proyector_local(puntos: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    (lat0, lon0, kx, ky) de una proyección equirectangular centrada en el bbox
+    de `puntos`: y = (lat - lat0) * ky, x = (lon - lon0) * kx, en metros.
+    A escala ciudad el error frente a haversine es < 0.1%.
+    """
+    lat0 = (float(puntos[:, 0].min()) + float(puntos[:, 0].max())) / 2.0
+    lon0 = (float(puntos[:, 1].min()) + float(puntos[:, 1].max())) / 2.0
+    ky = _R_TIERRA_M * pi / 180.0
+    return lat0, lon0, ky * cos(radians(lat0)), ky
+
+
+def _proyectar_m(latlon: np.ndarray, proj: Tuple[float, float, float, float]) -> np.ndarray:
+    """(..., 2) (lat, lon) en grados -> (..., 2) (y, x) en metros locales (mismo orden de columnas)."""
+    lat0, lon0, kx, ky = proj
+    yx = np.empty(latlon.shape, dtype=np.float64)
+    yx[..., 0] = (latlon[..., 0] - lat0) * ky
+    yx[..., 1] = (latlon[..., 1] - lon0) * kx
+    return yx
+
+
+def _desproyectar(yx: np.ndarray, proj: Tuple[float, float, float, float]) -> np.ndarray:
+    """Inversa de _proyectar_m: (..., 2) (y, x) en metros -> (lat, lon) en grados."""
+    lat0, lon0, kx, ky = proj
+    latlon = np.empty(yx.shape, dtype=np.float64)
+    latlon[..., 0] = yx[..., 0] / ky + lat0
+    latlon[..., 1] = yx[..., 1] / kx + lon0
+    return latlon
+
+
+def _indice_grid(
+    puntos_eval: Sequence[Tuple[float, float]],
+    proj: Optional[Tuple[float, float, float, float]] = None,
+) -> Tuple[cKDTree, Tuple[float, float, float, float]]:
+    """
+    KD-tree sobre los puntos de evaluación en metros locales.
+    El grid no cambia durante el GA: se construye una vez y cada cámara
+    consulta solo los puntos a <= radio en O(log M + k).
+    """
+    pts = np.asarray(puntos_eval, dtype=np.float64).reshape(-1, 2)
+    if proj is None:
+        proj = _proyector_local(pts)
+    return cKDTree(_proyectar_m(pts, proj)), proj
+
+
+def _conteo_cobertura_arbol(
+    arbol: cKDTree,
+    pop_m: np.ndarray,
+    radio_m: float,
+) -> np.ndarray:
+    """
+    Cámaras a <= radio_m de cada punto del grid, para toda la población: shape (P, M).
+    pop_m (P, N, 2) en metros locales; una sola consulta query_ball_point con las P*N cámaras.
+    """
+    n_pop, n_cam = pop_m.shape[:2]
+    if n_cam == 0 or arbol.n == 0:
+        return np.zeros((n_pop, arbol.n), dtype=np.int64)
+
+    vecinos = arbol.query_ball_point(pop_m.reshape(-1, 2), r=radio_m, workers=-1, return_sorted=False)
+    largos = np.fromiter(map(len, vecinos), dtype=np.intp, count=len(vecinos))
+    idx = np.fromiter(chain.from_iterable(vecinos), dtype=np.intp, count=int(largos.sum()))
+
+    # (individuo, punto) aplanado -> bincount da el conteo (P, M) de una vez
+    fila = np.repeat(np.arange(n_pop * n_cam) // n_cam, largos)
+    return np.bincount(fila * arbol.n + idx, minlength=n_pop * arbol.n).reshape(n_pop, arbol.n)
+
+
+# =========================================================
+#   COBERTURA BASE + UNA CÁMARA EXTRA (evaluación incremental)
+# =========================================================
+def preparar_cobertura_base(
+    camaras: Sequence[Tuple[float, float]],
+    radio_m: float,
+    step_m: float = 250.0,
+    margin_factor: float = 0.05,
+    max_points: int = 1500,
+) -> Dict[str, Any]:
+    """
+    Todo lo que no depende de una cámara simulada: grid, su KD-tree en metros,
+    conteo de cámaras por punto y métricas base. Se puede reutilizar mientras
+    las cámaras no cambien; ver cobertura_con_camara_extra.
+    """
+    puntos = generar_grid_puntos(camaras, step_m=step_m, margin_factor=margin_factor, max_points=max_points)
+    if len(puntos) == 0:
+        return {
+            "radio_m": radio_m,
+            "puntos": puntos,
+            "conteo": np.zeros(0, dtype=np.int64),
+            "sin_cubrir": 0,
+            "indice": None,
+            "metricas": metricas_niveles_cobertura(puntos, camaras, radio_m),
+        }
+
+    # un solo conteo M×N: de él salen sin_cubrir y las métricas base
+    conteo = _conteo_cobertura(puntos, camaras, radio_m)
+    return {
+        "radio_m": radio_m,
+        "puntos": puntos,
+        "conteo": conteo,
+        "sin_cubrir": int(np.count_nonzero(conteo == 0)),
+        "indice": _indice_grid(puntos),
+        "metricas": _metricas_desde_conteo(conteo),
+    }
+
+
+def cobertura_con_camara_extra(base: Dict[str, Any], punto: Tuple[float, float]) -> float:
+    """
+    cobertura_total (%) del grid de `base` al agregar una cámara en `punto`.
+    Solo los puntos a <= radio_m de la cámara pueden cambiar: se toman del
+    KD-tree y se confirman con haversine, sin recalcular el grid completo.
+    """
+    puntos = base["puntos"]
+    n = len(puntos)
+    if n == 0:
+        return 0.0
+
+    arbol, proj = base["indice"]
+    radio_m = base["radio_m"]
+
+    # Holgura del 1% en el radio por la proyección local; el filtro exacto es haversine
+    cand = arbol.query_ball_point(_proyectar_m(np.asarray(punto, dtype=np.float64), proj), r=radio_m * 1.01)
+    cand = np.asarray(cand, dtype=np.intp)
+    libres = cand[base["conteo"][cand] == 0]
+    nuevos = int(np.count_nonzero(_conteo_cobertura(puntos[libres], [punto], radio_m)))
+
+    # misma fórmula que metricas_niveles_cobertura: 100 - % sin cobertura
+    return 100.0 - ((base["sin_cubrir"] - nuevos) / n) * 100.0
+
+
 # =========================================================
 #   PENALIZACIÓN: cámaras demasiado cercanas
 # =========================================================
@@ -153,85 +404,100 @@ def _penalizar_camaras_muy_cercanas(
     min_dist_a_existentes_m: float,
     peso_penalizacion: float,
 ) -> float:
-    pen = 0.0
-
-    # nuevas vs nuevas
-    n = len(camaras_nuevas)
-    for i in range(n):
-        for j in range(i + 1, n):
-            d = haversine_m(
-                camaras_nuevas[i][0], camaras_nuevas[i][1],
-                camaras_nuevas[j][0], camaras_nuevas[j][1],
-            )
-            if d < min_dist_entre_nuevas_m:
-                pen += peso_penalizacion * (1.0 - (d / max(min_dist_entre_nuevas_m, 1e-6)))
+    pop_r = np.radians(np.asarray(camaras_nuevas, dtype=np.float64).reshape(1, -1, 2))
+    exist_r = np.radians(np.asarray(camaras_existentes, dtype=np.float64).reshape(-1, 2))
+    return float(_penalizacion_cercania_poblacion(
+        pop_r, exist_r,
+        min_dist_entre_nuevas_m, min_dist_a_existentes_m, peso_penalizacion,
+    )[0])
 
-    # nuevas vs existentes
-    if min_dist_a_existentes_m > 0:
-        for (lat, lon) in camaras_nuevas:
-            dmin = None
-            for (elat, elon) in camaras_existentes:
-                d = haversine_m(lat, lon, elat, elon)
-                if dmin is None or d < dmin:
-                    dmin = d
-            if dmin is not None and dmin < min_dist_a_existentes_m:
-                pen += (peso_penalizacion * 0.75) * (1.0 - (dmin / max(min_dist_a_existentes_m, 1e-6)))
 
+def _penalizacion_cercania(
+    d_pares: np.ndarray,
+    dmin_exist: Optional[np.ndarray],
+    min_dist_entre_nuevas_m: float,
+    min_dist_a_existentes_m: float,
+    peso_penalizacion: float,
+) -> np.ndarray:
+    """
+    Penalización (P,) a partir de distancias ya calculadas, en metros:
+    d_pares (P, K(K-1)/2) entre nuevas del mismo individuo y dmin_exist (P, K)
+    a la existente más cercana (None si no aplica).
+    """
+    # 1 - d/min > 0 solo si d < min, así que el clip reemplaza al if
+    pen = peso_penalizacion * np.clip(1.0 - d_pares / max(min_dist_entre_nuevas_m, 1e-6), 0.0, None).sum(axis=1)
+    if dmin_exist is not None:
+        pen += (peso_penalizacion * 0.75) * np.clip(1.0 - dmin_exist / max(min_dist_a_existentes_m, 1e-6), 0.0, None).sum(axis=1)
     return pen
 
 
+def _penalizacion_cercania_poblacion(
+    pop_r: np.ndarray,
+    exist_r: np.ndarray,
+    min_dist_entre_nuevas_m: float,
+    min_dist_a_existentes_m: float,
+    peso_penalizacion: float,
+) -> np.ndarray:
+    """Penalización por cercanía de cada individuo: pop_r (P, K, 2), exist_r (E, 2) en radianes -> (P,)."""
+    n = pop_r.shape[1]
+    lat = pop_r[..., 0]
+    lon = pop_r[..., 1]
+
+    # nuevas vs nuevas: solo los pares i < j de cada individuo, (P, K(K-1)/2)
+    i, j = np.triu_indices(n, k=1)
+    d_pares = _a_a_metros(_haversine_a_np(lat[:, i], lon[:, i], lat[:, j], lon[:, j]))
+
+    # nuevas vs existentes: mínimo sobre el tensor (P, K, E); 'a' es monótono con d
+    dmin = None
+    if min_dist_a_existentes_m > 0 and n and len(exist_r):
+        a = _haversine_a_np(lat[..., None], lon[..., None], exist_r[:, 0], exist_r[:, 1])
+        dmin = _a_a_metros(a.min(axis=2))
+
+    return _penalizacion_cercania(
+        d_pares, dmin, min_dist_entre_nuevas_m, min_dist_a_existentes_m, peso_penalizacion
+    )
+
+
 # =========================================================
 #   REPAIR: reubica puntos si violan distancias mínimas
 # =========================================================
 def _repair_separacion(
-    ind: List[Tuple[float, float]],
-    camaras_existentes: Sequence[Tuple[float, float]],
-    min_lat: float, max_lat: float, min_lon: float, max_lon: float,
+    ind: np.ndarray,
+    camaras_existentes: np.ndarray,
+    min_y: float, max_y: float, min_x: float, max_x: float,
     min_dist_entre_nuevas_m: float,
     min_dist_a_existentes_m: float,
-    max_iters: int = 35,
-) -> List[Tuple[float, float]]:
+    max_iters: int = 3,
+) -> np.ndarray:
     """
-    Repair más robusto:
-    - Trabaja sobre el bbox ampliado (min_lat/max_lat etc.)
-    - Si no logra reparar en N iters, devuelve lo mejor que tenga (no se atora).
+    Repair vectorizado, con puntos (y, x) en metros locales (ver _proyectar_m):
+    - ind (N, 2) y camaras_existentes (E, 2); regresa una copia (N, 2).
+    - Todas las violaciones salen de dos cdist 'sqeuclidean' (sin sqrt).
+    - Cada punto en conflicto se re-sortea en el bbox ampliado; tras
+      max_iters intentos se acepta lo que haya (no se atora).
     """
-    out = list(ind)
+    out = np.array(ind, dtype=np.float64).reshape(-1, 2)
+    exist = np.asarray(camaras_existentes, dtype=np.float64).reshape(-1, 2)
+    lo = np.array([min_y, min_x])
+    hi = np.array([max_y, max_x])
+    min_exist2 = min_dist_a_existentes_m * min_dist_a_existentes_m
+    min_nuevas2 = min_dist_entre_nuevas_m * min_dist_entre_nuevas_m
+    revisar_exist = min_dist_a_existentes_m > 0 and len(exist) > 0
 
     for _ in range(max_iters):
-        changed = False
+        # nuevas vs nuevas: de cada par (i < j) demasiado cercano se mueve j
+        malos = np.triu(cdist(out, out, "sqeuclidean") < min_nuevas2, k=1).any(axis=0)
 
         # contra existentes
-        if min_dist_a_existentes_m > 0:
-            for i, (lat, lon) in enumerate(out):
-                too_close = False
-                for (elat, elon) in camaras_existentes:
-                    if haversine_m(lat, lon, elat, elon) < min_dist_a_existentes_m:
-                        too_close = True
-                        break
-                if too_close:
-                    out[i] = (
-                        random.uniform(min_lat, max_lat),
-                        random.uniform(min_lon, max_lon),
-                    )
-                    changed = True
-
-        # nuevas vs nuevas
-        n = len(out)
-        for i in range(n):
-            for j in range(i + 1, n):
-                d = haversine_m(out[i][0], out[i][1], out[j][0], out[j][1])
-                if d < min_dist_entre_nuevas_m:
-                    out[j] = (
-                        random.uniform(min_lat, max_lat),
-                        random.uniform(min_lon, max_lon),
-                    )
-                    changed = True
-
-        if not changed:
+        if revisar_exist:
+            malos |= (cdist(out, exist, "sqeuclidean") < min_exist2).any(axis=1)
+
+        n_malos = int(malos.sum())
+        if not n_malos:
             break
+        out[malos] = _rng.uniform(lo, hi, size=(n_malos, 2))
 
-    out = [(_clamp(a, min_lat, max_lat), _clamp(b, min_lon, max_lon)) for (a, b) in out]
+    np.clip(out, lo, hi, out=out)
     return out
 
 
@@ -252,90 +518,180 @@ def fitness_cobertura(
     min_dist_a_existentes_m: float = 60.0,
     peso_cercania: float = 10.0,  # <- un poco menos agresivo
 ) -> float:
-    cam_tot = list(camaras_existentes) + list(camaras_nuevas)
-    met = metricas_niveles_cobertura(puntos_eval, cam_tot, radio_m)
+    return float(fitness_cobertura_poblacion(
+        puntos_eval=puntos_eval,
+        camaras_existentes=camaras_existentes,
+        poblacion=[list(camaras_nuevas)],
+        radio_m=radio_m,
+        penalizar_sobrecobertura=penalizar_sobrecobertura,
+        peso_sobrecobertura=peso_sobrecobertura,
+        penalizar_cercania=penalizar_cercania,
+        min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
+        min_dist_a_existentes_m=min_dist_a_existentes_m,
+        peso_cercania=peso_cercania,
+    )[0])
+
+
+def fitness_cobertura_poblacion(
+    puntos_eval: Sequence[Tuple[float, float]],
+    camaras_existentes: Sequence[Tuple[float, float]],
+    poblacion: Any,
+    radio_m: float,
+    penalizar_sobrecobertura: bool = True,
+    peso_sobrecobertura: float = 0.15,
+    penalizar_cercania: bool = True,
+    min_dist_entre_nuevas_m: float = 180.0,
+    min_dist_a_existentes_m: float = 60.0,
+    peso_cercania: float = 10.0,
+) -> np.ndarray:
+    """
+    Misma lógica que fitness_cobertura, pero para toda la población a la vez.
+    poblacion: (P, N, 2) con (lat, lon) de las N cámaras nuevas de cada individuo.
+    Devuelve un array (P,) con el fitness (0..100) de cada individuo.
+    """
+    pop = np.asarray(poblacion, dtype=np.float64).reshape(len(poblacion), -1, 2)
+    n_eval = len(puntos_eval)
+    if n_eval == 0:
+        return np.zeros(len(pop))
+
+    exist = np.asarray(camaras_existentes, dtype=np.float64).reshape(-1, 2)
+
+    pop_r = np.radians(pop)
+
+    # Conteo por punto = existentes (igual para todos) + nuevas de cada individuo, (P, M)
+    conteo = _conteo_cobertura(puntos_eval, exist, radio_m)[None, :]
+    conteo = conteo + _conteo_cobertura_poblacion(_preparar_puntos(puntos_eval), pop_r, radio_m)
+    score = _score_cobertura(conteo, penalizar_sobrecobertura, peso_sobrecobertura)
+
+    # Penaliza cercanías excesivas (para no amontonarlas)
+    if penalizar_cercania and pop.shape[1]:
+        score -= _penalizacion_cercania_poblacion(
+            pop_r, np.radians(exist),
+            min_dist_entre_nuevas_m, min_dist_a_existentes_m, peso_cercania,
+        )
+
+    return np.clip(score, 0.0, 100.0)
+
+
+def _score_cobertura(
+    conteo: np.ndarray,
+    penalizar_sobrecobertura: bool,
+    peso_sobrecobertura: float,
+) -> np.ndarray:
+    """Score base (P,) a partir del conteo (P, M) de cámaras por punto."""
+    pct = 100.0 / conteo.shape[1]
 
     # Base: cobertura total (0..100)
-    score = met["cobertura_total"]
+    score = np.count_nonzero(conteo, axis=1) * pct
 
     # Penaliza sobrecobertura alta (3+ cámaras cubriendo el mismo punto)
     if penalizar_sobrecobertura:
-        score -= peso_sobrecobertura * met["nivel_3_mas"]
+        score -= peso_sobrecobertura * (np.count_nonzero(conteo >= 3, axis=1) * pct)
 
-    # Penaliza cercanías excesivas (para no amontonarlas)
-    if penalizar_cercania and camaras_nuevas:
-        score -= _penalizar_camaras_muy_cercanas(
-            camaras_nuevas=camaras_nuevas,
-            camaras_existentes=camaras_existentes,
-            min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
-            min_dist_a_existentes_m=min_dist_a_existentes_m,
-            peso_penalizacion=peso_cercania,
-        )
+    return score
+
+
+def _kernel_fitness_m(
+    arbol_grid: cKDTree,
+    conteo_exist: np.ndarray,
+    exist_m: np.ndarray,
+    n_camaras: int,
+    radio_m: float,
+    penalizar_sobrecobertura: bool = True,
+    peso_sobrecobertura: float = 0.15,
+    penalizar_cercania: bool = True,
+    min_dist_entre_nuevas_m: float = 180.0,
+    min_dist_a_existentes_m: float = 60.0,
+    peso_cercania: float = 10.0,
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Fitness en metros locales especializado para un GA: grid en `arbol_grid`,
+    exist_m (E, 2) ya proyectado con _proyectar_m, conteo_exist (M,) = cámaras
+    existentes que cubren cada punto y N = n_camaras nuevas por individuo.
+    Lo que no cambia entre generaciones (pares i < j, KD-tree de existentes,
+    flags) se resuelve aquí una vez; el kernel devuelto recibe pop_m (P, N, 2)
+    y regresa el fitness (P,).
+    """
+    if arbol_grid.n == 0:
+        return lambda pop_m: np.zeros(len(pop_m))
+
+    i, j = np.triu_indices(n_camaras, k=1)
+    con_cercania = penalizar_cercania and n_camaras > 0
+    # existente más cercana por KD-tree en lugar del tensor (P, N, E)
+    arbol_exist = None
+    if con_cercania and min_dist_a_existentes_m > 0 and len(exist_m):
+        arbol_exist = cKDTree(exist_m)
+
+    def _kernel(pop_m: np.ndarray) -> np.ndarray:
+        conteo = _conteo_cobertura_arbol(arbol_grid, pop_m, radio_m)
+        conteo += conteo_exist
+        score = _score_cobertura(conteo, penalizar_sobrecobertura, peso_sobrecobertura)
+
+        if con_cercania:
+            d_pares = np.linalg.norm(pop_m[:, i] - pop_m[:, j], axis=-1)
+            dmin = None
+            if arbol_exist is not None:
+                dmin, _ = arbol_exist.query(pop_m.reshape(-1, 2), k=1, workers=-1)
+                dmin = dmin.reshape(pop_m.shape[:2])
+            score -= _penalizacion_cercania(
+                d_pares, dmin, min_dist_entre_nuevas_m, min_dist_a_existentes_m, peso_cercania
+            )
+
+        np.clip(score, 0.0, 100.0, out=score)
+        return score
 
-    return _clamp(score, 0.0, 100.0)
+    return _kernel
 
 
 # =========================================================
 #   GA: selección torneo + cruza BLX + mutación gauss
 # =========================================================
 def _seleccion_torneo(
-    poblacion: List[List[Tuple[float, float]]],
-    fitnesses: List[float],
+    poblacion: np.ndarray,
+    fitnesses: Sequence[float],
     k: int = 4,
     n: Optional[int] = None,
-) -> List[List[Tuple[float, float]]]:
+) -> np.ndarray:
+    """Todos los torneos a la vez: matriz (n, k) de contendientes (con reemplazo)."""
     if n is None:
         n = len(poblacion)
 
-    idxs = list(range(len(poblacion)))
-    out: List[List[Tuple[float, float]]] = []
+    fit = np.asarray(fitnesses, dtype=np.float64)
+    idxs = _rng.integers(0, len(poblacion), size=(n, max(1, k)))
+    ganadores = idxs[np.arange(n), fit[idxs].argmax(axis=1)]
 
-    for _ in range(n):
-        contendientes = random.sample(idxs, k=min(k, len(idxs)))
-        best = max(contendientes, key=lambda i: fitnesses[i])
-        out.append(poblacion[best])
-
-    return out
+    return poblacion[ganadores]
 
 
-def _blx(a: float, b: float, alpha: float) -> float:
-    lo = min(a, b)
-    hi = max(a, b)
+def _cruzar_blx(
+    p1: np.ndarray,
+    p2: np.ndarray,
+    alpha: float = 0.5,
+) -> np.ndarray:
+    """BLX-alpha por pares y por coordenada: p1/p2 (K, N, 2) -> K hijos (K, N, 2)."""
+    lo = np.minimum(p1, p2)
+    hi = np.maximum(p1, p2)
     d = hi - lo
-    return random.uniform(lo - alpha * d, hi + alpha * d)
+    return _rng.uniform(lo - alpha * d, hi + alpha * d)
 
 
-def _cruzar_individuo_blx(
-    p1: List[Tuple[float, float]],
-    p2: List[Tuple[float, float]],
-    alpha: float = 0.5,
-) -> List[Tuple[float, float]]:
-    n = min(len(p1), len(p2))
-    hijo: List[Tuple[float, float]] = []
-    for i in range(n):
-        lat = _blx(p1[i][0], p2[i][0], alpha)
-        lon = _blx(p1[i][1], p2[i][1], alpha)
-        hijo.append((lat, lon))
-    return hijo
-
-
-def _mutar_individuo_gauss(
-    ind: List[Tuple[float, float]],
-    min_lat: float, max_lat: float,
-    min_lon: float, max_lon: float,
+def _mutar_gauss(
+    pop: np.ndarray,
     prob_mut: float = 0.35,
-    sigma_lat: float = 0.0007,
-    sigma_lon: float = 0.0007,
-) -> List[Tuple[float, float]]:
-    out: List[Tuple[float, float]] = []
-    for lat, lon in ind:
-        if random.random() < prob_mut:
-            lat += random.gauss(0.0, sigma_lat)
-            lon += random.gauss(0.0, sigma_lon)
-        lat = _clamp(lat, min_lat, max_lat)
-        lon = _clamp(lon, min_lon, max_lon)
-        out.append((lat, lon))
-    return out
+    # ~0.0007° en metros a escala ciudad, (sigma_y, sigma_x)
+    sigma: Tuple[float, float] = (78.0, 78.0),
+) -> np.ndarray:
+    """
+    Mutación gaussiana in-place de toda la población (K, N, 2): cada cámara
+    muta con prob_mut en ambas coordenadas. No limita al bbox; el GA hace un
+    solo np.clip(..., out=) sobre los hijos ya cruzados y mutados.
+    """
+    mascara = _rng.random(pop.shape[:2]) < prob_mut
+    # ruido solo para las cámaras que sí mutan
+    ruido = _rng.standard_normal((int(np.count_nonzero(mascara)), 2))
+    ruido *= sigma
+    pop[mascara] += ruido
+    return pop
 
 
 # =========================================================
@@ -387,8 +743,9 @@ def algoritmo_genetico_mejorar_cobertura(
         )
 
     # Fallback si el grid quedó raro
-    if not puntos_eval:
-        puntos_eval = [(lat, lon) for (lat, lon) in random.sample(camaras_existentes, k=min(200, len(camaras_existentes)))]
+    if len(puntos_eval) == 0:
+        elegidas = _rng.choice(len(camaras_existentes), size=min(200, len(camaras_existentes)), replace=False)
+        puntos_eval = [camaras_existentes[i] for i in elegidas]
 
     min_lat0, max_lat0, min_lon0, max_lon0 = _bbox(camaras_existentes)
 
@@ -401,102 +758,121 @@ def algoritmo_genetico_mejorar_cobertura(
     min_lon = min_lon0 - lon_span * bbox_margin_factor
     max_lon = max_lon0 + lon_span * bbox_margin_factor
 
-    semillas = list(puntos_semilla or [])
-    # semillas también se clamp-ean al bbox ampliado
-    semillas = [(_clamp(a, min_lat, max_lat), _clamp(b, min_lon, max_lon)) for (a, b) in semillas]
-
-    def _crear_individuo() -> List[Tuple[float, float]]:
-        ind: List[Tuple[float, float]] = []
+    # Todo el GA trabaja en metros locales (y, x): distancias euclidianas sin
+    # trigonometría. Solo la mejor solución se regresa a (lat, lon) al final.
+    exist_arr = np.asarray(camaras_existentes, dtype=np.float64)
+    proj = _proyector_local(exist_arr)
+    exist_m = _proyectar_m(exist_arr, proj)
+    min_y, min_x = _proyectar_m(np.array([min_lat, min_lon]), proj).tolist()
+    max_y, max_x = _proyectar_m(np.array([max_lat, max_lon]), proj).tolist()
 
-        # usa semillas si hay
-        if semillas and random.random() < prob_usar_semilla:
-            take = min(len(semillas), n_camaras_nuevas)
-            ind.extend(random.sample(semillas, k=take))
+    # sigma de la mutación: 0.0007° por eje, convertido a metros
+    _, _, kx, ky = proj
+    sigma_y = 0.0007 * ky
+    sigma_x = 0.0007 * kx
 
-        # completa aleatorio dentro bbox ampliado
-        while len(ind) < n_camaras_nuevas:
-            ind.append((random.uniform(min_lat, max_lat), random.uniform(min_lon, max_lon)))
-
-        # clamp coherente al bbox ampliado
-        ind = [(_clamp(a, min_lat, max_lat), _clamp(b, min_lon, max_lon)) for (a, b) in ind]
-
-        if penalizar_cercania:
-            ind = _repair_separacion(
-                ind,
-                camaras_existentes=camaras_existentes,
-                min_lat=min_lat, max_lat=max_lat,
-                min_lon=min_lon, max_lon=max_lon,
+    # semillas también se clamp-ean al bbox ampliado
+    semillas = np.asarray(list(puntos_semilla or []), dtype=np.float64).reshape(-1, 2)
+    semillas_m = _proyectar_m(np.clip(semillas, (min_lat, min_lon), (max_lat, max_lon)), proj)
+
+    # Población SoA: array (P, N, 2) contiguo en lugar de listas de tuplas.
+    # Lo aleatorio de la población inicial sale de unas pocas llamadas al Generator.
+    lo = np.array([min_y, min_x])
+    hi = np.array([max_y, max_x])
+    poblacion = _rng.uniform(lo, hi, size=(tam_poblacion, n_camaras_nuevas, 2))
+
+    # usa semillas si hay: con prob_usar_semilla el individuo toma `take` semillas distintas
+    take = min(len(semillas_m), n_camaras_nuevas)
+    if take:
+        con_semilla = np.flatnonzero(_rng.random(tam_poblacion) < prob_usar_semilla)
+        # una permutación por fila (argsort de uniformes) y sus primeras `take` columnas
+        elegidas = np.argsort(_rng.random((len(con_semilla), len(semillas_m))), axis=1)[:, :take]
+        poblacion[con_semilla, :take] = semillas_m[elegidas]
+
+    if penalizar_cercania and n_camaras_nuevas:
+        for r in range(tam_poblacion):
+            poblacion[r] = _repair_separacion(
+                poblacion[r],
+                camaras_existentes=exist_m,
+                min_y=min_y, max_y=max_y,
+                min_x=min_x, max_x=max_x,
                 min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
                 min_dist_a_existentes_m=min_dist_a_existentes_m,
             )
-        return ind
 
-    poblacion: List[List[Tuple[float, float]]] = [_crear_individuo() for _ in range(tam_poblacion)]
+    # KD-tree del grid una sola vez para todas las generaciones
+    arbol_grid, _ = _indice_grid(puntos_eval, proj)
 
-    best_ind: List[Tuple[float, float]] = []
+    # Cobertura de las existentes: invariante en todas las generaciones
+    conteo_exist = _conteo_cobertura_arbol(arbol_grid, exist_m[None], radio_m)[0]
+
+    best_ind = np.empty((0, 2))
     best_fit: float = -1.0
 
+    # Dos buffers (P, N, 2) que se alternan: la siguiente generación se escribe
+    # sobre el buffer de la anterior, sin reservar memoria dentro del bucle.
+    siguiente = np.empty_like(poblacion)
+    n_elite = min(max(1, elitismo), tam_poblacion)
+    n_hijos = tam_poblacion - n_elite
+
+    # Kernel especializado una vez para este N y radio; se reutiliza en cada generación
+    fitness = _kernel_fitness_m(
+        arbol_grid,
+        conteo_exist,
+        exist_m,
+        n_camaras_nuevas,
+        radio_m,
+        penalizar_sobrecobertura=penalizar_sobrecobertura,
+        penalizar_cercania=penalizar_cercania,
+        min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
+        min_dist_a_existentes_m=min_dist_a_existentes_m,
+        peso_cercania=peso_cercania,
+    )
+
     for _ in range(generaciones):
-        fitnesses: List[float] = []
-
-        for ind in poblacion:
-            fit = fitness_cobertura(
-                puntos_eval=puntos_eval,
-                camaras_existentes=camaras_existentes,
-                camaras_nuevas=ind,
-                radio_m=radio_m,
-                penalizar_sobrecobertura=penalizar_sobrecobertura,
-                penalizar_cercania=penalizar_cercania,
-                min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
-                min_dist_a_existentes_m=min_dist_a_existentes_m,
-                peso_cercania=peso_cercania,
-            )
-            fitnesses.append(_clamp(fit, 0.0, 100.0))
-
-        i_best = max(range(len(poblacion)), key=lambda i: fitnesses[i])
-        if fitnesses[i_best] > best_fit:
-            best_fit = fitnesses[i_best]
-            best_ind = poblacion[i_best]
-
-        # elites
-        orden = sorted(range(len(poblacion)), key=lambda i: fitnesses[i], reverse=True)
-        elites = [poblacion[i] for i in orden[:max(1, elitismo)]]
-
-        padres = _seleccion_torneo(poblacion, fitnesses, k=k_torneo, n=tam_poblacion)
-
-        nueva: List[List[Tuple[float, float]]] = []
-        nueva.extend(elites)
-
-        while len(nueva) < tam_poblacion:
-            p1 = random.choice(padres)
-            p2 = random.choice(padres)
-            hijo = _cruzar_individuo_blx(p1, p2, alpha=alpha_blx)
-            hijo = _mutar_individuo_gauss(
-                hijo,
-                min_lat=min_lat, max_lat=max_lat,
-                min_lon=min_lon, max_lon=max_lon,
-            )
-            hijo = [(_clamp(a, min_lat, max_lat), _clamp(b, min_lon, max_lon)) for (a, b) in hijo]
-
-            if penalizar_cercania:
-                hijo = _repair_separacion(
-                    hijo,
-                    camaras_existentes=camaras_existentes,
-                    min_lat=min_lat, max_lat=max_lat,
-                    min_lon=min_lon, max_lon=max_lon,
+        # Toda la población en un solo kernel en lugar de un fitness por individuo
+        fit = fitness(poblacion)
+
+        i_best = int(fit.argmax())
+        if fit[i_best] > best_fit:
+            best_fit = float(fit[i_best])
+            best_ind = poblacion[i_best].copy()
+
+        # elites: top-k con argpartition, O(P) en lugar de ordenar todo
+        top = np.argpartition(-fit, n_elite - 1)[:n_elite]
+        siguiente[:n_elite] = poblacion[top]
+
+        padres = _seleccion_torneo(poblacion, fit, k=k_torneo, n=tam_poblacion)
+
+        # Hijos de una vez: cruza + mutación sobre la vista (K, N, 2) del buffer
+        hijos = siguiente[n_elite:]
+        # Todas las parejas en un solo sorteo (n_hijos, 2) de índices de padres
+        pares = _rng.integers(0, len(padres), size=(n_hijos, 2))
+        hijos[...] = _cruzar_blx(padres[pares[:, 0]], padres[pares[:, 1]], alpha=alpha_blx)
+        _mutar_gauss(hijos, sigma=(sigma_y, sigma_x))
+        np.clip(hijos, lo, hi, out=hijos)
+
+        if penalizar_cercania and n_camaras_nuevas:
+            for r in range(n_hijos):
+                hijos[r] = _repair_separacion(
+                    hijos[r],
+                    camaras_existentes=exist_m,
+                    min_y=min_y, max_y=max_y,
+                    min_x=min_x, max_x=max_x,
                     min_dist_entre_nuevas_m=min_dist_entre_nuevas_m,
                     min_dist_a_existentes_m=min_dist_a_existentes_m,
                 )
 
-            nueva.append(hijo)
+        poblacion, siguiente = siguiente, poblacion
 
-        poblacion = nueva
+    # de vuelta a (lat, lon) solo para la respuesta
+    best_latlon = _desproyectar(best_ind, proj).tolist()
 
-    cam_tot = list(camaras_existentes) + list(best_ind)
+    cam_tot = list(camaras_existentes) + [tuple(p) for p in best_latlon]
     met = metricas_niveles_cobertura(puntos_eval, cam_tot, radio_m)
 
     return {
-        "camaras_nuevas": [(float(a), float(b)) for (a, b) in best_ind],
+        "camaras_nuevas": [(float(a), float(b)) for (a, b) in best_latlon],
         "fitness": float(best_fit),
         "metricas": {k: float(v) for k, v in met.items()},
     }